@@ -7,36 +7,86 @@
 # Licensed under the MIT License. See LICENSE file for details.
 """
 
-import asyncio, json, sys, platform, re, shutil, argparse, curses, math
+import asyncio, json, sys, platform, re, shutil, argparse, curses, math, itertools, os, socket, struct
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Deque, Tuple
 
 try:
     import winsound
 except Exception:
     winsound = None
 
+try:
+    import orjson
+    _dumps = orjson.dumps  # returns bytes
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
 VERSION = "1.0.0"
 
 DEFAULT_HOSTS = ["1.1.1.1", "8.8.8.8", "github.com", "google.com", "amazon.com", "facebook.com"]
+DEFAULT_LOSS_WIN = 30
+DEFAULT_HIST_SIZE = 40
+MAX_PING_PROCS = 32  # cap on concurrent `ping` subprocesses in fallback mode
+RESOLVE_TTL = 60.0   # seconds to reuse a host's resolved IPv4 address on the ICMP path
+
+# Platform bits for the subprocess ping path, resolved once at import
+_SYS = platform.system().lower()
+_IS_WIN = _SYS.startswith("win")
+_IS_MAC = _SYS == "darwin"
+_RX_WIN = re.compile(r"time[=<]\s*(\d+)\s*ms|Average = (\d+)\s*ms", re.I)
+_PING_BIN = shutil.which("ping")
+# One echo (-n/-c 1) with a timeout (-w/-W); ping_cmd appends the timeout value and host
+_PING_PREFIX = ["ping", "-n", "1", "-w"] if _IS_WIN else ["ping", "-c", "1", "-W"]
+
+# Preformatted "NNN" cells so the draw loop indexes instead of formatting (values clamp at 9999)
+_RTT_STR = tuple(f"{i:>3}" for i in range(10000))
+_RTT_MAX = len(_RTT_STR) - 1
+_NONE_TOK = "---"
+
+# Jitter EWMA kept as an integer upscaled by 2**JITTER_SHIFT; gain g = JITTER_GAIN / 2**JITTER_SHIFT
+JITTER_SHIFT = 4
+JITTER_GAIN = 5  # 5/16 ~= 0.3
 
 
 @dataclass
 class Host:
     name: str
     rtt: Optional[float] = None
-    jitter: float = 0.0
+    jitter_up: int = 0  # jitter ms << JITTER_SHIFT
     loss_pct: float = 0.0
-    loss_window: List[int] = field(default_factory=list)  # 0 ok, 1 loss
-    history: List[Optional[float]] = field(default_factory=list)
+    # Fixed-size rings: append evicts the oldest sample in O(1)
+    loss_window: Deque[int] = field(default_factory=lambda: deque(maxlen=DEFAULT_LOSS_WIN))  # 0 ok, 1 loss
+    history: Deque[Optional[int]] = field(default_factory=lambda: deque(maxlen=DEFAULT_HIST_SIZE))  # rounded ms
+    # Running totals over the rings, updated per sample so draws stay O(1)
+    sum_rtt: int = 0
+    count_rtt: int = 0
+    loss_sum: int = 0
+    samples: int = 0    # total samples taken; keeps growing once the rings are full
+    last_seen: int = 0  # `samples` at the UI's last beep check
+
+    @property
+    def jitter(self) -> int:
+        """Jitter in whole ms (rounded downscale of jitter_up)."""
+        return (self.jitter_up + (1 << (JITTER_SHIFT - 1))) >> JITTER_SHIFT
+
+
+def positive_int(value: str) -> int:
+    """argparse type: integer >= 1."""
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {value}")
+    return n
 
 
 def parse_args():
     p = argparse.ArgumentParser(description=f"xPing {VERSION} — ASCII ping dashboard (CLI)")
     p.add_argument("--hosts", nargs="+", default=DEFAULT_HOSTS, help="Hosts to ping")
     p.add_argument("--interval", type=float, default=1.0, help="Ping interval seconds")
-    p.add_argument("--loss-window", type=int, default=30, help="Window for loss calculation")
-    p.add_argument("--hist-size", type=int, default=40, help="History length")
+    p.add_argument("--loss-window", type=positive_int, default=DEFAULT_LOSS_WIN, help="Window for loss calculation")
+    p.add_argument("--hist-size", type=positive_int, default=DEFAULT_HIST_SIZE, help="History length")
     p.add_argument("--timeout-ms", type=int, default=1000, help="Ping timeout in ms")
     p.add_argument("--sort", choices=["name", "rtt", "loss", "jitter"], default="name", help="Sort rows by this field")
     p.add_argument("--descending", action="store_true", help="Sort descending")
@@ -58,7 +108,7 @@ def alert(stdscr, mode: str):
         curses.beep(); return
     except Exception:
         pass
-    if platform.system().lower().startswith("win") and winsound:
+    if _IS_WIN and winsound:
         try:
             winsound.MessageBeep(-1); return
         except Exception:
@@ -73,32 +123,179 @@ def alert(stdscr, mode: str):
 
 
 def ping_cmd(host: str, timeout_ms: int):
-    sysname = platform.system().lower()
-    if sysname.startswith("win"):
-        # -n 1 one echo; -w timeout ms
-        return (["ping", "-n", "1", "-w", str(timeout_ms), host],
-                re.compile(r"time[=<]\s*(\d+)\s*ms|Average = (\d+)\s*ms", re.I))
-    elif sysname == "darwin":
-        # -c 1 one echo; -W timeout ms (mac accepts ms)
-        return (["ping", "-c", "1", "-W", str(timeout_ms), host],
-                re.compile(r"time[=<]\s*([\d\.]+)\s*ms", re.I))
+    if _IS_WIN or _IS_MAC:
+        tout = timeout_ms  # Windows -w and mac -W take ms
     else:
-        # Linux: -c 1; -W timeout sec (ceil from ms)
-        tout = max(1, math.ceil(timeout_ms / 1000))
-        return (["ping", "-c", "1", "-W", str(tout), host],
-                re.compile(r"time[=<]\s*([\d\.]+)\s*ms", re.I))
+        tout = max(1, math.ceil(timeout_ms / 1000))  # Linux -W takes seconds (ceil from ms)
+    return _PING_PREFIX + [str(tout), host]
+
+
+def round_ms(x: float) -> int:
+    """Round a non-negative ms value half-up; the single rounding rule for every display."""
+    return int(x + 0.5)
+
+
+def icmp_checksum(data: bytes) -> int:
+    """RFC 1071 internet checksum."""
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+class IcmpSocket:
+    """Shared unprivileged ICMP echo socket (Linux/macOS).
+
+    One datagram per ping; a single reader callback matches replies to
+    waiting futures by sequence number and stamps the RTT on arrival.
+    """
+
+    def __init__(self, sock: socket.socket, loop: asyncio.AbstractEventLoop):
+        self.sock = sock
+        self.loop = loop
+        self.ident = os.getpid() & 0xFFFF  # Linux rewrites this to the socket's port
+        self.token = os.urandom(8)         # echoed back; filters replies meant for others
+        self.seq = 0
+        self.waiters: Dict[int, Tuple[float, asyncio.Future]] = {}
+        self.addrs: Dict[str, Tuple[Optional[str], float]] = {}  # host -> (IPv4 address or None, expiry)
+        self.lookups: Dict[str, asyncio.Future] = {}  # host -> in-flight getaddrinfo
+        loop.add_reader(sock.fileno(), self._on_readable)
+
+    @classmethod
+    def open(cls) -> Optional["IcmpSocket"]:
+        """Return a ready socket, or None if unprivileged ICMP isn't available here."""
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+        except (OSError, AttributeError):
+            return None
+        sock.setblocking(False)
+        try:
+            return cls(sock, asyncio.get_running_loop())
+        except NotImplementedError:
+            # e.g. Windows proactor loop has no add_reader
+            sock.close()
+            return None
+
+    def _on_readable(self):
+        while True:
+            try:
+                data, _ = self.sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            now = self.loop.time()
+            # macOS includes the IPv4 header; Linux hands us the bare ICMP message
+            if data and data[0] >> 4 == 4:
+                data = data[(data[0] & 0x0F) * 4:]
+            if len(data) < 8 + len(self.token) or data[0] != 0:  # type 0 = echo reply
+                continue
+            if data[8:8 + len(self.token)] != self.token:
+                continue
+            seq = struct.unpack_from("!H", data, 6)[0]
+            waiter = self.waiters.pop(seq, None)
+            if waiter is not None and not waiter[1].done():
+                waiter[1].set_result((now - waiter[0]) * 1000.0)
+
+    async def resolve(self, host: str, timeout_ms: int) -> Optional[str]:
+        """Cached IPv4 address for host, or None if it has none (IPv6 literal, AAAA-only, NXDOMAIN).
+
+        The lookup gets the same bound as a subprocess ping (timeout_ms + 1.5 s) and
+        raises asyncio.TimeoutError past it. A timed-out lookup keeps running and
+        fills the cache when it lands, so a slow resolver costs a sample, not every one.
+        """
+        cached = self.addrs.get(host)
+        if cached is not None and cached[1] > self.loop.time():
+            return cached[0]
+        fut = self.lookups.get(host)
+        if fut is None:
+            fut = asyncio.ensure_future(
+                self.loop.getaddrinfo(host, None, family=socket.AF_INET, type=socket.SOCK_DGRAM))
+            self.lookups[host] = fut
+            fut.add_done_callback(lambda f, host=host: self._store_lookup(host, f))
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), timeout=(timeout_ms / 1000) + 1.5)
+        except asyncio.TimeoutError:
+            raise  # a subclass of OSError on 3.11+; must not look like "no IPv4 address"
+        except Exception:
+            pass  # lookup failed; _store_lookup has cached the negative result
+        return self.addrs[host][0]
+
+    def _store_lookup(self, host: str, fut: asyncio.Future):
+        self.lookups.pop(host, None)
+        if fut.cancelled():
+            return
+        # Failures are cached too, so hosts without IPv4 don't hit the resolver every tick
+        addr = None if fut.exception() is not None else fut.result()[0][4][0]
+        self.addrs[host] = (addr, self.loop.time() + RESOLVE_TTL)
+
+    async def ping(self, addr: str, timeout_ms: int) -> Optional[float]:
+        """One echo to an IPv4 address; RTT in ms or None on timeout/error."""
+        self.seq = (self.seq + 1) & 0xFFFF
+        seq = self.seq
+        header = struct.pack("!BBHHH", 8, 0, 0, self.ident, seq)
+        pkt = struct.pack("!BBHHH", 8, 0, icmp_checksum(header + self.token), self.ident, seq) + self.token
+
+        fut = self.loop.create_future()
+        self.waiters[seq] = (self.loop.time(), fut)
+        try:
+            self.sock.sendto(pkt, (addr, 0))
+            return await asyncio.wait_for(fut, timeout=timeout_ms / 1000)
+        except (OSError, asyncio.TimeoutError):
+            return None
+        finally:
+            self.waiters.pop(seq, None)
+
+    def close(self):
+        self.loop.remove_reader(self.sock.fileno())
+        self.sock.close()
 
 
-async def ping_once(host: str, timeout_ms: int) -> Optional[float]:
-    if not shutil.which("ping"):
+async def ping_once(host: str, timeout_ms: int, icmp: Optional[IcmpSocket] = None,
+                    sem: Optional[asyncio.Semaphore] = None) -> Optional[float]:
+    if icmp is not None:
+        try:
+            addr = await icmp.resolve(host, timeout_ms)
+        except asyncio.TimeoutError:
+            return None
+        if addr is not None:
+            return await icmp.ping(addr, timeout_ms)
+        # No IPv4 address: the system ping can still reach IPv6 hosts
+    if sem is None:
+        return await ping_subprocess(host, timeout_ms)
+    async with sem:
+        return await ping_subprocess(host, timeout_ms)
+
+
+async def ping_subprocess(host: str, timeout_ms: int) -> Optional[float]:
+    """Fallback: one echo via the system `ping` binary (Windows, or no ICMP socket)."""
+    if not _PING_BIN:
         return None
-    cmd, rx = ping_cmd(host, timeout_ms)
+    cmd = ping_cmd(host, timeout_ms)
     try:
         proc = await asyncio.create_subprocess_exec(
             *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
         )
-        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=(timeout_ms / 1000) + 1.5)
-        m = rx.search(stdout.decode(errors="ignore"))
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=(timeout_ms / 1000) + 1.5)
+        except asyncio.TimeoutError:
+            # Reap the stray ping so it doesn't outlive its semaphore slot
+            proc.kill()
+            await proc.wait()
+            return None
+        if not _IS_WIN:
+            # Linux/macOS reply line is always "... time=12.3 ms": scan the raw bytes
+            idx = stdout.rfind(b" time=")
+            if idx < 0:
+                return None
+            end = stdout.find(b" ms", idx)
+            if end < 0:
+                return None
+            return float(stdout[idx + 6:end])
+        # Windows output varies ("time<1ms", localized Average) so keep the regex
+        m = _RX_WIN.search(stdout.decode(errors="ignore"))
         if not m:
             return None
         groups = [g for g in m.groups() if g]
@@ -109,32 +306,63 @@ async def ping_once(host: str, timeout_ms: int) -> Optional[float]:
         return None
 
 
-async def pinger(hosts: Dict[str, Host], interval: float, loss_win: int, timeout_ms: int, hist_size: int):
+async def pinger(hosts: Dict[str, Host], interval: float, timeout_ms: int, dirty: Optional[asyncio.Event] = None):
+    icmp = IcmpSocket.open()
+    # Subprocess pings (no ICMP socket, or IPv6-only hosts): bound concurrent process
+    # spawns so big host lists degrade gracefully
+    sem = asyncio.Semaphore(max(1, min(len(hosts), MAX_PING_PROCS)))
+    try:
+        await _ping_loop(hosts, interval, timeout_ms, dirty, icmp, sem)
+    finally:
+        if icmp is not None:
+            icmp.close()
+
+
+async def _ping_loop(hosts: Dict[str, Host], interval: float, timeout_ms: int, dirty: Optional[asyncio.Event],
+                     icmp: Optional[IcmpSocket], sem: asyncio.Semaphore):
+    async def probe(name: str):
+        return name, await ping_once(name, timeout_ms, icmp, sem)
+
     while True:
-        tasks = [(name, asyncio.create_task(ping_once(name, timeout_ms))) for name in hosts.keys()]
-        for name, task in tasks:
-            rtt = await task
+        # Handle replies as they land so a slow host doesn't hold up the fast ones
+        for fut in asyncio.as_completed([probe(name) for name in hosts.keys()]):
+            name, rtt = await fut
             h = hosts[name]
 
-            # update loss window
-            h.loss_window.append(1 if rtt is None else 0)
-            if len(h.loss_window) > loss_win:
-                h.loss_window = h.loss_window[-loss_win:]
-            h.loss_pct = 100.0 * (sum(h.loss_window) / max(1, len(h.loss_window)))
+            # update loss window (subtract the sample about to be evicted)
+            lost = 1 if rtt is None else 0
+            if h.loss_window and len(h.loss_window) == h.loss_window.maxlen:
+                h.loss_sum -= h.loss_window[0]
+            h.loss_window.append(lost)
+            h.loss_sum += lost
+            h.loss_pct = 100.0 * h.loss_sum / max(1, len(h.loss_window))
 
-            # jitter EWMA
+            # jitter EWMA, upscaled integer form: x_up += g*S*delta - g*x_up (S = 2**JITTER_SHIFT)
             if rtt is not None:
                 if h.rtt is not None:
-                    delta = abs(rtt - h.rtt)
-                    h.jitter = 0.7 * h.jitter + 0.3 * delta
+                    delta = round_ms(abs(rtt - h.rtt))
+                    h.jitter_up += JITTER_GAIN * delta - ((JITTER_GAIN * h.jitter_up) >> JITTER_SHIFT)
                 else:
-                    h.jitter = 0.0
+                    h.jitter_up = 0
                 h.rtt = rtt
 
-            # history ring
-            h.history.append(rtt)
-            if len(h.history) > hist_size:
-                h.history = h.history[-hist_size:]
+            # history ring + rolling avg totals; samples are rounded once here so
+            # renders never re-round (and the integer sum can't drift)
+            if h.history and len(h.history) == h.history.maxlen:
+                old = h.history[0]
+                if old is not None:
+                    h.sum_rtt -= old
+                    h.count_rtt -= 1
+            sample = None if rtt is None else round_ms(rtt)
+            h.history.append(sample)
+            h.samples += 1
+            if sample is not None:
+                h.sum_rtt += sample
+                h.count_rtt += 1
+
+            # wake the UI: new data to draw
+            if dirty is not None:
+                dirty.set()
 
         await asyncio.sleep(interval)
 
@@ -147,53 +375,73 @@ def sort_hosts(hosts: List[Host], key: str, desc: bool) -> List[Host]:
     if key == "loss":
         return sorted(hosts, key=lambda h: h.loss_pct, reverse=desc)
     if key == "jitter":
-        return sorted(hosts, key=lambda h: h.jitter, reverse=desc)
+        return sorted(hosts, key=lambda h: h.jitter_up, reverse=desc)
     return hosts
 
-def avg_ms(history: List[Optional[float]]) -> Optional[int]:
-    vals = [v for v in history if v is not None]
-    if not vals:
+def avg_ms(h: Host) -> Optional[int]:
+    """Rolling average over the history buffer (ignores timeouts)."""
+    if h.count_rtt == 0:
         return None
-    return int(round(sum(vals) / len(vals)))
+    return round_ms(h.sum_rtt / h.count_rtt)
+
+# Damage tracking for draw_table: screen size last drawn at and the text on each row,
+# plus the layout (widths, static strings) cached under key (maxy, maxx, bell_mode)
+_render_state = {"size": None, "rows": {}, "key": None}
 
 def draw_table(stdscr, rows: list, bell_mode: str):
-    stdscr.erase()
     maxy, maxx = stdscr.getmaxyx()
-
-    header = "xPing Table - CLI ping dashboard"
-    stdscr.addstr(0, max(0, (maxx - len(header)) // 2), header[:maxx - 1])
-
-    # Column widths
-    name_w = max(12, min(24, maxx // 5))
     rtt_w  = 7
     jit_w  = 7
     loss_w = 6
     avg_w  = 7  # AVG column width
-    fixed = 2 + name_w + rtt_w + jit_w + loss_w + avg_w  # separators included
-    avail = max(0, maxx - fixed - 2)
-    slots = max(4, avail // 4)  # "NNN " per sample
+    rs = _render_state
+    drawn: Dict[int, str] = rs["rows"]
+    if rs["size"] != (maxy, maxx):
+        # Full repaint only on resize (and first frame)
+        stdscr.erase()
+        drawn.clear()
+        rs["size"] = (maxy, maxx)
+
+    key = (maxy, maxx, bell_mode)
+    if rs["key"] != key:
+        # Column widths
+        name_w = max(12, min(24, maxx // 5))
+        fixed = 2 + name_w + rtt_w + jit_w + loss_w + avg_w  # separators included
+        avail = max(0, maxx - fixed - 2)
+        slots = max(4, avail // 4)  # "NNN " per sample
+        title = "xPing Table - CLI ping dashboard"
+        rs.update(
+            key=key,
+            name_w=name_w,
+            slots=slots,
+            tok_buf=[_NONE_TOK] * slots,  # reused history tokens, one per slot
+            title=" " * max(0, (maxx - len(title)) // 2) + title,
+            header=(
+                f"{'NAME'.ljust(name_w)} | "
+                f"{'RTT'.rjust(rtt_w)} | "
+                f"{'JITTER'.rjust(jit_w)} | "
+                f"{'LOSS'.rjust(loss_w)} | "
+                f"{'AVG'.rjust(avg_w)} | "
+                f"HISTORY (newest→oldest)"
+            ),
+            legend=f"Legend: --- no reply, newest on LEFT, b=beep({'ON' if bell_mode == 'on' else 'OFF'}), q=quit",
+        )
+    name_w = rs["name_w"]
+    slots = rs["slots"]
+    tok_buf = rs["tok_buf"]
 
     def line(y: int, text: str):
         if 0 <= y < maxy:
-            stdscr.addstr(y, 0, text[:maxx - 1])
-
-    # Header row
-    line(
-        2,
-        f"{'NAME'.ljust(name_w)} | "
-        f"{'RTT'.rjust(rtt_w)} | "
-        f"{'JITTER'.rjust(jit_w)} | "
-        f"{'LOSS'.rjust(loss_w)} | "
-        f"{'AVG'.rjust(avg_w)} | "
-        f"HISTORY (newest→oldest)"
-    )
-
-    # Helper: rolling average over visible history buffer (ignores timeouts)
-    def avg_ms(history: List[Optional[float]]) -> str:
-        vals = [v for v in history if v is not None]
-        if not vals:
-            return "--"
-        return str(int(round(sum(vals) / len(vals))))
+            text = text[:maxx - 1]
+            if drawn.get(y) == text:
+                return
+            stdscr.move(y, 0)
+            stdscr.clrtoeol()
+            stdscr.addstr(y, 0, text)
+            drawn[y] = text
+
+    line(0, rs["title"])
+    line(2, rs["header"])
 
     y = 3
     for h in rows:
@@ -201,48 +449,60 @@ def draw_table(stdscr, rows: list, bell_mode: str):
             break
 
         name = h.name[:name_w].ljust(name_w)
-        rtt  = ("--" if h.rtt is None else f"{int(round(h.rtt))}").rjust(rtt_w)
-        jit  = f"{int(round(h.jitter))}".rjust(jit_w)
-        loss = f"{int(round(h.loss_pct))}%".rjust(loss_w)
-        avg  = avg_ms(h.history).rjust(avg_w)
-
-        # Left-anchored numeric ticker: newest on LEFT
-        hist_vals = list(reversed(h.history[-slots:]))  # newest first
-        hist_vals += [None] * (slots - len(hist_vals))  # pad right
-        tokens = [("---" if v is None else f"{int(round(v)):>3}") for v in hist_vals]
-        hist = " ".join(tokens)
+        rtt  = ("--" if h.rtt is None else _RTT_STR[min(round_ms(h.rtt), _RTT_MAX)]).rjust(rtt_w)
+        jit  = _RTT_STR[min(h.jitter, _RTT_MAX)].rjust(jit_w)
+        loss = f"{round_ms(h.loss_pct)}%".rjust(loss_w)
+        a    = avg_ms(h)
+        avg  = ("--" if a is None else str(a)).rjust(avg_w)
+
+        # Left-anchored numeric ticker: newest on LEFT, written into the reused buffer
+        n = 0
+        for n, v in enumerate(itertools.islice(reversed(h.history), 0, slots), 1):  # newest first
+            tok_buf[n - 1] = _NONE_TOK if v is None else _RTT_STR[min(v, _RTT_MAX)]
+        for i in range(n, slots):  # pad right
+            tok_buf[i] = _NONE_TOK
+        hist = " ".join(tok_buf)
 
         line(y, f"{name} | {rtt} | {jit} | {loss} | {avg} | {hist}")
         y += 1
 
-    legend = f"Legend: --- no reply, newest on LEFT, b=beep({'ON' if bell_mode == 'on' else 'OFF'}), q=quit"
-    line(maxy - 1, legend)
-    stdscr.refresh()
+    line(maxy - 1, rs["legend"])
+    stdscr.noutrefresh()
+    curses.doupdate()
 
 
 async def ui_loop(stdscr, hosts: Dict[str, Host], args):
     curses.curs_set(0)
     stdscr.nodelay(True)
 
-    # Start pinger
-    asyncio.create_task(pinger(hosts, args.interval, args.loss_window, args.timeout_ms, args.hist_size))
+    # Start pinger; it sets `dirty` whenever a host gets a new sample
+    dirty = asyncio.Event()
+    asyncio.create_task(pinger(hosts, args.interval, args.timeout_ms, dirty))
 
     beep_enabled = bool(getattr(args, "beep", False))
-    last_seen_len: Dict[str, int] = {name: 0 for name in hosts.keys()}
+    redraw = True
+    fresh = False  # pinger delivered new samples since the last draw
+    # Row order only changes when samples do; names never change, so a name sort is final
+    order = sort_hosts(list(hosts.values()), args.sort, args.descending)
+    resort = False
 
     while True:
-        order = sort_hosts(list(hosts.values()), args.sort, args.descending)
-
-        # Beep on every successful reply
-        if beep_enabled:
-            for h in order:
-                cur_len = len(h.history)
-                if cur_len > last_seen_len.get(h.name, 0):
-                    if h.history[-1] is not None:
-                        alert(stdscr, "beep")
-                    last_seen_len[h.name] = cur_len
-
-        draw_table(stdscr, order, "on" if beep_enabled else "off")
+        if redraw:
+            if resort:
+                order = sort_hosts(order, args.sort, args.descending)
+                resort = False
+
+            # Beep on every successful reply
+            if fresh and beep_enabled:
+                for h in order:
+                    if h.samples > h.last_seen:
+                        if h.history[-1] is not None:
+                            alert(stdscr, "beep")
+                        h.last_seen = h.samples
+            fresh = False
+
+            draw_table(stdscr, order, "on" if beep_enabled else "off")
+            redraw = False
 
         try:
             ch = stdscr.getch()
@@ -252,14 +512,24 @@ async def ui_loop(stdscr, hosts: Dict[str, Host], args):
                 beep_enabled = not beep_enabled
             if ch == ord("B"):
                 alert(stdscr, "beep")  # manual test
+            if ch != -1:
+                redraw = True  # key press or KEY_RESIZE
         except curses.error:
             pass
 
-        await asyncio.sleep(0.05)
+        # Sleep until new data arrives; the timeout keeps key polling responsive
+        try:
+            await asyncio.wait_for(dirty.wait(), timeout=0.1)
+        except asyncio.TimeoutError:
+            pass
+        if dirty.is_set():
+            dirty.clear()
+            redraw = fresh = True
+            resort = args.sort != "name"
 
 async def ui_json(hosts: Dict[str, Host], args):
     # Start pinger
-    asyncio.create_task(pinger(hosts, args.interval, args.loss_window, args.timeout_ms, args.hist_size))
+    asyncio.create_task(pinger(hosts, args.interval, args.timeout_ms))
     # Stream batch JSON lines once per UI refresh (~20 fps might be overkill; use interval/2 min 0.2s)
     refresh = max(0.2, min(args.interval, 1.0))
     while True:
@@ -269,19 +539,32 @@ async def ui_json(hosts: Dict[str, Host], args):
             # Derive console width if possible; for JSON just send the whole history buffer
             snapshot.append({
                 "name": h.name,
-                "rtt": None if h.rtt is None else int(round(h.rtt)),
-                "jitter": int(round(h.jitter)),
-                "loss_pct": int(round(h.loss_pct)),
-                "avg": avg_ms(h.history),
-                "history": [None if v is None else int(round(v)) for v in h.history],
+                "rtt": None if h.rtt is None else round_ms(h.rtt),
+                "jitter": h.jitter,
+                "loss_pct": round_ms(h.loss_pct),
+                "avg": avg_ms(h),
+                "samples": h.samples,
+                "history": list(h.history),
             })
-        sys.stdout.write(json.dumps({"type": "snapshot", "hosts": snapshot}) + "\n")
-        sys.stdout.flush()
+        # One bytes write per snapshot, bypassing the text layer
+        out = sys.stdout.buffer
+        out.write(_dumps({"type": "snapshot", "hosts": snapshot}) + b"\n")
+        out.flush()
         await asyncio.sleep(refresh)
 
 def main():
     args = parse_args()
-    hosts: Dict[str, Host] = {h: Host(h) for h in args.hosts}
+    if sys.platform != "win32":
+        # Faster event loop when available (optional dependency)
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
+    hosts: Dict[str, Host] = {
+        h: Host(h, loss_window=deque(maxlen=args.loss_window), history=deque(maxlen=args.hist_size))
+        for h in args.hosts
+    }
     if args.json:
         # Headless JSON mode for GUI frontends
         asyncio.run(ui_json(hosts, args))
@@ -8,13 +8,20 @@ Requires: PyQt6
 # Licensed under the MIT License. See LICENSE file for details.
 """
 
-import json, sys
+import json, sys, itertools
+from dataclasses import dataclass
 from pathlib import Path
 
-from PyQt6.QtCore import Qt, QProcess, QTimer
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+from PyQt6.QtCore import Qt, QProcess, QTimer, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QTableWidget, QTableWidgetItem, QHeaderView, QSpinBox, QCheckBox,
+    QTableView, QHeaderView, QSpinBox, QCheckBox,
     QTextEdit, QComboBox, QMessageBox, QGroupBox, QFormLayout, QFileDialog, QLabel
 )
 
@@ -36,6 +43,127 @@ def which_python() -> str:
     # Use the current interpreter to avoid venv surprises
     return sys.executable or "python3"
 
+
+HIST_SLOTS = 24  # history samples shown per row
+
+# Sort combobox choice -> model column
+SORT_COLUMNS = {"name": 0, "rtt": 1, "jitter": 2, "loss": 3, "avg": 4}
+NUM_COL_WIDTH = 60  # px; numeric ms columns rarely exceed 4 chars
+
+
+@dataclass
+class HostState:
+    """GUI-side per-host bookkeeping."""
+    last_seen: int = 0  # sample count at the last beep check
+
+
+class HostTableModel(QAbstractTableModel):
+    """One row per host, fed from CLI snapshots.
+
+    Rows stay in arrival order; a QSortFilterProxyModel does the ordering.
+    Only cells whose text changed are reported via dataChanged.
+    """
+
+    HEADERS = ["Host", "RTT", "Jitter", "Loss %", "AVG", "History (newest→oldest)"]
+    FIELDS = ["name", "rtt", "jitter", "loss_pct", "avg", None]  # snapshot key per column
+    SORT_ROLE = Qt.ItemDataRole.UserRole
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._hosts = []   # row -> latest snapshot dict
+        self._cells = []   # row -> list of display strings
+        self._rows = {}    # name -> row
+        self.descending = False  # keeps hosts without data at the bottom either way
+        self._tok_buf = ["---"] * HIST_SLOTS  # reused history tokens
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._cells)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._cells[index.row()][index.column()]
+        if role == self.SORT_ROLE:
+            h = self._hosts[index.row()]
+            field = self.FIELDS[index.column()]
+            if field is None or field == "name":
+                return h.get("name", "").lower()
+            v = h.get(field)
+            if v is None:
+                return float("-inf") if self.descending else float("inf")
+            return float(v)
+        return None
+
+    def format_cells(self, h):
+        hist = h.get("history", [])
+        # Build left-anchored history string (newest on left) in the reused token buffer
+        buf = self._tok_buf
+        n = 0
+        for n, v in enumerate(itertools.islice(reversed(hist), HIST_SLOTS), 1):  # newest first
+            buf[n - 1] = "---" if v is None else f"{v:>3}"
+        for i in range(n, HIST_SLOTS):
+            buf[i] = "---"
+
+        def num(v):
+            return "--" if v is None else str(int(v))
+
+        return [
+            h.get("name", "?"),
+            num(h.get("rtt")),
+            num(h.get("jitter")),
+            num(h.get("loss_pct")),
+            num(h.get("avg")),
+            " ".join(buf),
+        ]
+
+    def update_rows(self, hosts_snapshot) -> bool:
+        """Apply a snapshot; returns True if any host row was added."""
+        inserted = False
+        # Bounding box of changed cells; reported with one dataChanged per snapshot
+        top = left = None
+        bottom = right = -1
+        for h in hosts_snapshot:
+            name = h.get("name", "?")
+            cells = self.format_cells(h)
+            row = self._rows.get(name)
+            if row is None:
+                row = len(self._cells)
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._hosts.append(h)
+                self._cells.append(cells)
+                self._rows[name] = row
+                self.endInsertRows()
+                inserted = True
+                continue
+            self._hosts[row] = h
+            old = self._cells[row]
+            changed = [c for c in range(len(cells)) if cells[c] != old[c]]
+            if changed:
+                self._cells[row] = cells
+                top = row if top is None else min(top, row)
+                bottom = max(bottom, row)
+                left = changed[0] if left is None else min(left, changed[0])
+                right = max(right, changed[-1])
+        if top is not None:
+            self.dataChanged.emit(self.index(top, left), self.index(bottom, right))
+        return inserted
+
+    def clear(self):
+        self.beginResetModel()
+        self._hosts.clear()
+        self._cells.clear()
+        self._rows.clear()
+        self.endResetModel()
+
 class XPingGUI(QWidget):
     def __init__(self):
         super().__init__()
@@ -43,11 +171,11 @@ class XPingGUI(QWidget):
         self.resize(1000, 640)
 
         self.proc = None
-        self.host_rows = {}  # name -> row index
         self.stopping = False
 
         self.last_snapshot = []  # cache of last hosts snapshot from CLI
-        self.last_seen_len = {}  # host -> last history length we saw (for GUI beeps)
+        self.host_state = {}  # host -> HostState (for GUI beeps)
+        self._buf = bytearray()  # partial CLI output awaiting a newline
 
         # --- Controls ---
         # Hosts box (left)
@@ -106,14 +234,22 @@ class XPingGUI(QWidget):
         btn_row.addWidget(self.quit_btn)
 
         # --- Table ---
-        self.table = QTableWidget(0, 6)
-        self.table.setHorizontalHeaderLabels(["Host", "RTT", "Jitter", "Loss %", "AVG", "History (newest→oldest)"])
+        # model (per-host cells) -> proxy (sorting, done in C++) -> view
+        self.model = HostTableModel(self)
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setSortRole(HostTableModel.SORT_ROLE)
+        self.proxy.setDynamicSortFilter(True)
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+        # Host column stretches; numeric columns are fixed so no per-frame text measuring
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        for c in range(1, 6):
-            self.table.horizontalHeader().setSectionResizeMode(c, QHeaderView.ResizeMode.ResizeToContents)
+        for c in range(1, 5):
+            self.table.setColumnWidth(c, NUM_COL_WIDTH)
         self.table.verticalHeader().setVisible(False)
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.resort_current()
 
         # --- Layout ---
         layout = QVBoxLayout()
@@ -182,11 +318,11 @@ class XPingGUI(QWidget):
             cli_args.extend(["--hosts"] + hosts)
 
         # Reset per-host counters for GUI beeps
-        self.last_seen_len.clear()
+        self.host_state.clear()
+        self._buf.clear()
 
         # Reset table
-        self.table.setRowCount(0)
-        self.host_rows.clear()
+        self.model.clear()
 
         # Spawn process
         self.proc = QProcess(self)
@@ -250,15 +386,24 @@ class XPingGUI(QWidget):
     def read_output(self):
         if not self.proc:
             return
-        while self.proc.canReadLine():
-            raw = bytes(self.proc.readLine()).decode("utf-8", errors="ignore").strip()
+        # Drain everything available in one call and split lines ourselves
+        buf = self._buf
+        buf += self.proc.readAll().data()
+        while True:
+            i = buf.find(b"\n")
+            if i < 0:
+                break
+            raw = bytes(buf[:i]).strip()
+            del buf[:i + 1]
             if not raw:
                 continue
             # Expect newline-delimited JSON
             try:
-                data = json.loads(raw)
-            except json.JSONDecodeError:
-                # Not JSON: ignore or log
+                data = _loads(raw)
+            except ValueError:
+                # Not JSON (or not UTF-8): ignore
+                continue
+            if not isinstance(data, dict):
                 continue
             if data.get("type") == "snapshot":
                 self.last_snapshot = data.get("hosts", [])
@@ -267,130 +412,51 @@ class XPingGUI(QWidget):
                     for h in self.last_snapshot:
                         name = h.get("name", "")
                         hist = h.get("history", [])
-                        cur_len = len(hist)
-                        prev_len = self.last_seen_len.get(name, 0)
-                        if cur_len > prev_len:
+                        # "samples" keeps counting after the history buffer is full
+                        cur = h.get("samples", len(hist))
+                        st = self.host_state.get(name)
+                        if st is None:
+                            st = self.host_state[name] = HostState()
+                        if cur > st.last_seen:
                             # New sample arrived; beep only if it's a successful reply
-                            if cur_len > 0 and hist[-1] is not None:
+                            if hist and hist[-1] is not None:
                                 QApplication.beep()
-                            self.last_seen_len[name] = cur_len
-                sorted_hosts = self.sort_snapshot(self.last_snapshot)
-                self.update_table(sorted_hosts)
+                            st.last_seen = cur
+                self.update_table(self.last_snapshot)
 
     def resort_current(self):
-        if not self.last_snapshot:
-            return
-        sorted_hosts = self.sort_snapshot(self.last_snapshot)
-        self.update_table(sorted_hosts)
-
-    def ensure_row(self, name: str) -> int:
-        if name in self.host_rows:
-            return self.host_rows[name]
-        row = self.table.rowCount()
-        self.table.insertRow(row)
-        self.host_rows[name] = row
-        # Pre-create columns
-        for c in range(self.table.columnCount()):
-            item = QTableWidgetItem("")
-            if c == 0:
-                item.setData(Qt.ItemDataRole.DisplayRole, name)
-            self.table.setItem(row, c, item)
-        return row
+        # Point the proxy at the chosen column; it keeps rows ordered as data changes
+        desc = self.desc.isChecked()
+        self.model.descending = desc
+        self.proxy.invalidate()
+        self.proxy.sort(SORT_COLUMNS.get(self.sort.currentText(), 0),
+                        Qt.SortOrder.DescendingOrder if desc else Qt.SortOrder.AscendingOrder)
 
     def sort_snapshot(self, hosts_snapshot):
+        # Read the Qt widgets once, not per comparison
         key = self.sort.currentText()
         desc = self.desc.isChecked()
+        field = HostTableModel.FIELDS[SORT_COLUMNS[key]] if key in SORT_COLUMNS else "name"
 
-        def k(h):
-            # None-safe extraction for numeric sorts
-            def val(field):
-                v = h.get(field)
-                if v is None:
-                    return float('inf') if not desc else float('-inf')
-                return float(v)
-            if key == "name":
+        if field == "name":
+            def k(h):
                 return h.get("name", "").lower()
-            if key == "rtt":
-                return val("rtt")
-            if key == "loss":
-                return val("loss_pct")
-            if key == "jitter":
-                return val("jitter")
-            if key == "avg":
-                return val("avg")
-            return h.get("name", "").lower()
+        else:
+            # None-safe numeric sort: hosts without data stay at the bottom
+            missing = float("-inf") if desc else float("inf")
 
-        return sorted(hosts_snapshot, key=k, reverse=desc)
+            def k(h):
+                v = h.get(field)
+                return missing if v is None else float(v)
 
-    def move_row(self, old_row, new_row):
-        if old_row == new_row:
-            return
-        cols = self.table.columnCount()
-        items = [self.table.takeItem(old_row, c) for c in range(cols)]
-        self.table.removeRow(old_row)
-        # adjust target index if removing from above
-        if old_row < new_row:
-            new_row -= 1
-        self.table.insertRow(new_row)
-        for c, it in enumerate(items):
-            if it is None:
-                it = QTableWidgetItem("")
-            self.table.setItem(new_row, c, it)
-
-    def rebuild_row_index(self):
-        self.host_rows.clear()
-        for r in range(self.table.rowCount()):
-            it = self.table.item(r, 0)
-            name = it.text() if it else ""
-            self.host_rows[name] = r
+        return sorted(hosts_snapshot, key=k, reverse=desc)
 
     def update_table(self, hosts_snapshot):
-        # First pass: ensure rows exist and update cell contents
-        for h in hosts_snapshot:
-            name = h.get("name", "?")
-            row = self.ensure_row(name)
-
-            rtt = h.get("rtt")
-            jitter = h.get("jitter")
-            loss = h.get("loss_pct")
-            avg = h.get("avg")
-            hist = h.get("history", [])
-
-            # Build left-anchored history string (newest on left)
-            tail = hist[-24:]
-            disp = list(reversed(tail))  # newest first
-            disp += [None] * (24 - len(disp))
-            tokens = [("---" if v is None else f"{int(v):>3}") for v in disp]
-            hist_str = " ".join(tokens)
-
-            def set_col(col, val):
-                item = self.table.item(row, col)
-                if item is None:
-                    item = QTableWidgetItem("")
-                    self.table.setItem(row, col, item)
-                item.setText(val)
-
-            set_col(0, name)
-            set_col(1, "--" if rtt is None else str(int(rtt)))
-            set_col(2, "--" if jitter is None else str(int(jitter)))
-            set_col(3, "--" if loss is None else str(int(loss)))
-            set_col(4, "--" if avg is None else str(int(avg)))
-            set_col(5, hist_str)
-
-        # Second pass: physically reorder rows to match hosts_snapshot order
-        # Build current mapping name -> row
-        self.rebuild_row_index()
-        for desired_index, h in enumerate(hosts_snapshot):
-            name = h.get("name", "?")
-            current_index = self.host_rows.get(name, desired_index)
-            if current_index != desired_index:
-                self.move_row(current_index, desired_index)
-                # After moving, rebuild index to keep it accurate
-                self.rebuild_row_index()
-
-        # Resize numeric columns (host column stretches)
-        for c in range(1, 6):
-            self.table.resizeColumnToContents(c)
+        # Model diffs by host name; the proxy re-sorts only if sorted values changed
+        cols_dirty = self.model.update_rows(hosts_snapshot)
+        # History column is fixed-width text; measure it only when rows are added
+        if cols_dirty:
+            self.table.resizeColumnToContents(5)
 
     def export_results(self):
         if not self.last_snapshot: